@@ -1,12 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional, Dict, Any
 import os
-from app.utils.aws_operations import get_candidates_by_score_range, update_candidate_verdict, get_all_candidates_by_job_id, get_candidate, S3_BUCKET_NAME, aws_region
+import json
+import hashlib
+from app.utils.aws_operations import get_candidates_by_score_range, update_candidate_verdict, get_all_candidates_by_job_id, get_candidate, get_job_version, generate_presigned_urls, presigned_url_cache_tag, s3_url_to_key, S3_BUCKET_NAME, aws_region
+from app.utils.http_caching import json_response, etag_matches, not_modified_response
+from app.utils.rate_limiter import ThrottlingError
 from decimal import Decimal
 
 router = APIRouter()
 
+# Response field -> candidate attributes holding the S3 reference to sign, in order of preference
+DOWNLOAD_URL_FIELDS = {
+    'resume_url': ('s3_resume_key', 'resume_key'),
+    'parsed_url': ('s3_parsed_key',),
+    'jd_analysis_url': ('jd_analysis_url',),
+    'cultural_analysis_url': ('cultural_analysis_url',),
+}
+
 class CustomCriteriaScore(BaseModel):
     name: str
     score: int
@@ -29,6 +41,7 @@ class CandidateResponse(BaseModel):
     uniqueness_justification: Optional[str] = None
     absolute_score: Optional[float] = None
     resume_key: Optional[str] = None
+    resume_url: Optional[str] = None
 
 class CandidateListResponse(BaseModel):
     candidate_id: str
@@ -44,16 +57,52 @@ class CandidateListResponse(BaseModel):
     absolute_score: Optional[float] = None
     custom_criteria_scores: Optional[List[CustomCriteriaScore]] = None
     resume_key: Optional[str] = None
+    resume_url: Optional[str] = None
+    parsed_url: Optional[str] = None
+    jd_analysis_url: Optional[str] = None
+    cultural_analysis_url: Optional[str] = None
+
+candidate_response_adapter = TypeAdapter(List[CandidateResponse])
+candidate_list_response_adapter = TypeAdapter(List[CandidateListResponse])
 
 class VerdictRequest(BaseModel):
     job_id: str
     candidate_id: str
     verdict_comment: str
 
+def with_download_urls(candidates):
+    """
+    Return copies of the candidates with presigned S3 download links for
+    resumes and analyses, signed together in a single batch
+    """
+    candidates = [dict(candidate) for candidate in candidates]
+    keys_by_candidate = []
+    for candidate in candidates:
+        keys = {}
+        for field, sources in DOWNLOAD_URL_FIELDS.items():
+            value = next((candidate[source] for source in sources if candidate.get(source)), None)
+            keys[field] = s3_url_to_key(value)
+        keys_by_candidate.append(keys)
+
+    urls = generate_presigned_urls(
+        key for keys in keys_by_candidate for key in keys.values()
+    )
+    for candidate, keys in zip(candidates, keys_by_candidate):
+        for field, key in keys.items():
+            if key in urls:
+                candidate[field] = urls[key]
+    return candidates
+
 @router.get("/candidates/range", response_model=List[CandidateResponse])
-async def get_candidates_in_range(min_score: Optional[int] = 45, max_score: Optional[int] = 55):
+def get_candidates_in_range(request: Request, min_score: Optional[int] = 45, max_score: Optional[int] = 55):
     """
     Get all candidates with absolute scores between min_score and max_score and status IN_CONSIDERATION
+
+    The ETag is a hash of the stored candidate items and the presigned URL
+    epoch, so it is the same on every worker and a matching If-None-Match
+    gets a 304 before any URL is signed or the response is serialized. When
+    expiring credentials shorten URL lifetimes, the ETag is a hash of the
+    response body instead
     """
     try:
         expression_values = {
@@ -64,14 +113,34 @@ async def get_candidates_in_range(min_score: Optional[int] = 45, max_score: Opti
         candidates = get_candidates_by_score_range(min_score, max_score, status='IN_CONSIDERATION')
         if candidates is None:
             raise HTTPException(status_code=500, detail="Error fetching candidates")
-        return candidates
+
+        etag = None
+        url_tag = presigned_url_cache_tag()
+        if url_tag is not None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(json.dumps(candidates, sort_keys=True, default=str).encode('utf-8'))
+            etag = f'W/"{digest.hexdigest()}-{url_tag}"'
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
+        body = candidate_response_adapter.dump_json(
+            candidate_response_adapter.validate_python(with_download_urls(candidates))
+        )
+        return json_response(request, body, etag)
+    except ThrottlingError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch candidates: {str(e)}")
 
 @router.get("/candidates/getAllCandidates", response_model=List[CandidateListResponse])
-async def get_all_candidates(job_id: str = "TL001"):
+def get_all_candidates(request: Request, job_id: str = "TL001"):
     """
     Get all candidates for a specific job_id
+
+    The ETag comes from the job's change counter and the presigned URL
+    epoch, so a matching If-None-Match gets a 304 without querying the
+    candidate list. When expiring credentials shorten URL lifetimes, the
+    ETag is a hash of the response body instead
     """
     try:
         # Check if AWS credentials are configured
@@ -90,6 +159,15 @@ async def get_all_candidates(job_id: str = "TL001"):
                 }
             )
 
+        etag = None
+        url_tag = presigned_url_cache_tag()
+        version = get_job_version(job_id) if url_tag is not None else None
+        if version is not None:
+            job_hash = hashlib.blake2b(job_id.encode('utf-8'), digest_size=8).hexdigest()
+            etag = f'W/"{job_hash}-v{version}-{url_tag}"'
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
         candidates = get_all_candidates_by_job_id(job_id)
         if candidates is None:
             raise HTTPException(
@@ -99,8 +177,11 @@ async def get_all_candidates(job_id: str = "TL001"):
                     "message": "Failed to fetch candidates from DynamoDB. Please check AWS configuration."
                 }
             )
-        return candidates
-    except HTTPException:
+        body = candidate_list_response_adapter.dump_json(
+            candidate_list_response_adapter.validate_python(with_download_urls(candidates))
+        )
+        return json_response(request, body, etag)
+    except (HTTPException, ThrottlingError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -112,7 +193,7 @@ async def get_all_candidates(job_id: str = "TL001"):
         )
 
 @router.post("/candidates/reject")
-async def reject_candidate(request: VerdictRequest):
+def reject_candidate(request: VerdictRequest):
     """
     Reject a candidate by updating their status to REJECTED
     """
@@ -124,13 +205,13 @@ async def reject_candidate(request: VerdictRequest):
                 detail=error_message
             )
         return {"message": "Candidate rejected successfully"}
-    except HTTPException:
+    except (HTTPException, ThrottlingError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to reject candidate: {str(e)}")
 
 @router.post("/candidates/accept")
-async def accept_candidate(request: VerdictRequest):
+def accept_candidate(request: VerdictRequest):
     """
     Accept a candidate by updating their status to ACCEPTED
     """
@@ -142,7 +223,7 @@ async def accept_candidate(request: VerdictRequest):
                 detail=error_message
             )
         return {"message": "Candidate accepted successfully"}
-    except HTTPException:
+    except (HTTPException, ThrottlingError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to accept candidate: {str(e)}")
@@ -0,0 +1,289 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ConfigDict, Field, ValidationError, field_validator
+from typing import Optional
+from decimal import Decimal
+from datetime import datetime
+import asyncio
+import csv
+import json
+import tempfile
+import time
+from app.controllers.candidate_controller import CandidateListResponse, CandidateResponse
+from app.utils.aws_operations import batch_write_items_to_dynamodb, DYNAMODB_BATCH_SIZE, JOB_VERSION_SORT_KEY
+
+router = APIRouter()
+
+# Upper bound for concurrent BatchWriteItem calls per upload
+MAX_PARALLEL_WRITERS = 8
+
+# Per-row results are spooled to disk once they grow past this many bytes
+RESULTS_SPOOL_SIZE = 1024 * 1024
+
+# CSV records parsed per hop to the worker thread
+CSV_ROWS_PER_READ = 100
+
+class BulkCandidateItem(CandidateListResponse, CandidateResponse):
+    """
+    A candidate row accepted by bulk ingestion. Every attribute the candidate
+    endpoints read back is validated against their response models, so a bad
+    row is rejected here instead of breaking those endpoints later
+    """
+    model_config = ConfigDict(extra='allow')
+
+    job_id: str = Field(min_length=1)
+    candidate_id: str = Field(min_length=1)
+    status: str = 'IN_CONSIDERATION'
+    # Decimal keeps scores storable in DynamoDB, which rejects floats
+    jd_score: Optional[Decimal] = None
+    cultural_fit_score: Optional[Decimal] = None
+    uniqueness_score: Optional[Decimal] = None
+    custom_criteria_score: Optional[Decimal] = None
+    absolute_score: Optional[Decimal] = None
+
+    @field_validator('candidate_id')
+    @classmethod
+    def not_reserved(cls, value):
+        # This sort key holds the job's change counter
+        if value == JOB_VERSION_SORT_KEY:
+            raise ValueError(f"'{JOB_VERSION_SORT_KEY}' is reserved")
+        return value
+
+class _BlockingLines:
+    """
+    Blocking iterator over the decoded lines of an upload, so csv.reader can
+    run in a worker thread and handle quoting itself while the body is still
+    being streamed in on the event loop
+    """
+    def __init__(self, lines, loop):
+        self._lines = lines
+        self._loop = loop
+        # Set when a line of the current record is not valid UTF-8
+        self.decode_error = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        future = asyncio.run_coroutine_threadsafe(self._lines.__anext__(), self._loop)
+        try:
+            raw_line = future.result()
+        except StopAsyncIteration:
+            raise StopIteration
+        try:
+            return raw_line.decode('utf-8') + '\n'
+        except UnicodeDecodeError as e:
+            self.decode_error = f"Invalid UTF-8: {str(e)}"
+            return raw_line.decode('utf-8', errors='replace') + '\n'
+
+def _read_csv_rows(reader, lines, limit):
+    """
+    Read up to `limit` records as (values, error) pairs, followed by None at the end of the upload
+    """
+    rows = []
+    while len(rows) < limit:
+        lines.decode_error = None
+        try:
+            values = next(reader)
+        except StopIteration:
+            rows.append(None)
+            break
+        except csv.Error as e:
+            # Includes quoted fields running past csv.field_size_limit(), which bounds memory
+            rows.append((None, f"Invalid CSV: {str(e)}"))
+            continue
+        if values:
+            rows.append((values, lines.decode_error))
+    return rows
+
+async def _iter_lines(request: Request):
+    """
+    Yield raw lines (without the line terminator) from the request body as it is streamed in
+    """
+    buffer = b''
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.rstrip(b'\r')
+    if buffer:
+        yield buffer.rstrip(b'\r')
+
+async def _iter_records(request: Request, upload_format: str):
+    """
+    Yield (row_number, record, error) for every non-empty row of an NDJSON or CSV upload
+    """
+    if upload_format == 'csv':
+        async for row in _iter_csv_records(request):
+            yield row
+        return
+
+    row_number = 0
+    async for raw_line in _iter_lines(request):
+        if not raw_line.strip():
+            continue
+        row_number += 1
+        try:
+            # Decimal keeps scores storable in DynamoDB, which rejects floats
+            record = json.loads(raw_line.decode('utf-8'), parse_float=Decimal)
+        except UnicodeDecodeError as e:
+            yield row_number, None, f"Invalid UTF-8: {str(e)}"
+            continue
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Expected a JSON object"
+            continue
+        yield row_number, record, None
+
+async def _iter_csv_records(request: Request):
+    lines = _BlockingLines(_iter_lines(request), asyncio.get_running_loop())
+    reader = csv.reader(lines)
+    header = None
+    row_number = 0
+
+    while True:
+        rows = await asyncio.to_thread(_read_csv_rows, reader, lines, CSV_ROWS_PER_READ)
+        for row in rows:
+            if row is None:
+                return
+            values, error_message = row
+            if header is None and not error_message:
+                # Columns without a name can't become DynamoDB attributes
+                header = [value.strip() for value in values]
+                continue
+            row_number += 1
+            if error_message:
+                yield row_number, None, error_message
+                continue
+            # Empty cells are treated as missing attributes
+            yield row_number, {key: value for key, value in zip(header, values) if key and value != ''}, None
+
+async def _write_batch(batch):
+    """
+    Write a batch of (row_number, item) pairs and return (row_number, item, error) per row
+    """
+    failed = await asyncio.to_thread(
+        batch_write_items_to_dynamodb, [item for _, item in batch]
+    )
+    errors = {(item['job_id'], item['candidate_id']): error_message for item, error_message in failed}
+    return [
+        (row_number, item, errors.get((item['job_id'], item['candidate_id'])))
+        for row_number, item in batch
+    ]
+
+@router.post("/candidates/bulk")
+async def bulk_ingest_candidates(
+    request: Request,
+    job_id: Optional[str] = None,
+    upload_format: Optional[str] = Query(None, alias="format"),
+    max_writers: int = 4
+):
+    """
+    Bulk ingest candidates from a streamed NDJSON or CSV request body.
+
+    Rows are validated and written with DynamoDB batch writes using a bounded
+    number of parallel writers. The response is NDJSON with one result per row
+    followed by a summary line with totals and throughput. If the upload is
+    cut short, the results collected so far are still returned with the error
+    in the summary.
+    """
+    if upload_format is None:
+        content_type = request.headers.get('content-type', '')
+        upload_format = 'csv' if 'csv' in content_type else 'ndjson'
+    if upload_format not in ('ndjson', 'csv'):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    max_writers = max(1, min(max_writers, MAX_PARALLEL_WRITERS))
+
+    results = tempfile.SpooledTemporaryFile(max_size=RESULTS_SPOOL_SIZE, mode='w+')
+    summary = {"received": 0, "written": 0, "rejected": 0, "failed": 0}
+    started_at = time.monotonic()
+
+    def record_result(row_number, status, candidate_id=None, detail=None):
+        summary[status] += 1
+        result = {"row": row_number, "status": status}
+        if candidate_id is not None:
+            result["candidate_id"] = candidate_id
+        if detail is not None:
+            result["detail"] = detail
+        results.write(json.dumps(result) + '\n')
+
+    pending = set()
+    batch = []
+    batch_keys = set()
+
+    async def collect(return_when):
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        pending.difference_update(done)
+        for task in done:
+            for row_number, item, error_message in task.result():
+                if error_message:
+                    record_result(row_number, "failed", item['candidate_id'], error_message)
+                else:
+                    record_result(row_number, "written", item['candidate_id'])
+
+    async def submit():
+        nonlocal batch, batch_keys
+        # Wait for a writer slot; this also stops reading the upload until one is free
+        if len(pending) >= max_writers:
+            await collect(asyncio.FIRST_COMPLETED)
+        pending.add(asyncio.create_task(_write_batch(batch)))
+        batch, batch_keys = [], set()
+
+    status_code = 200
+    try:
+        async for row_number, record, error_message in _iter_records(request, upload_format):
+            summary["received"] += 1
+            if error_message:
+                record_result(row_number, "rejected", detail=error_message)
+                continue
+
+            if job_id and not record.get('job_id'):
+                record['job_id'] = job_id
+            try:
+                candidate = BulkCandidateItem(**record)
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors())
+                record_result(row_number, "rejected", record.get('candidate_id'), detail)
+                continue
+
+            # Empty attribute names are rejected by DynamoDB for the whole batch
+            # Download URLs are signed on read, never stored
+            item = candidate.model_dump(exclude_none=True, exclude={'resume_url', 'parsed_url'})
+            item = {key: value for key, value in item.items() if key}
+            item.setdefault('ingested_at', datetime.now().isoformat())
+
+            # BatchWriteItem rejects requests containing the same key twice
+            key = (item['job_id'], item['candidate_id'])
+            if key in batch_keys:
+                await submit()
+            batch.append((row_number, item))
+            batch_keys.add(key)
+            if len(batch) >= DYNAMODB_BATCH_SIZE:
+                await submit()
+    except Exception as e:
+        # Rows read so far are still written and reported; the rest of the upload is lost
+        status_code = 500
+        summary["error"] = f"Bulk ingestion stopped: {str(e)}"
+        print(summary["error"])
+    finally:
+        if batch:
+            await submit()
+        if pending:
+            await collect(asyncio.ALL_COMPLETED)
+
+    elapsed = time.monotonic() - started_at
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["items_per_second"] = round(summary["written"] / elapsed, 1) if elapsed > 0 else None
+
+    def stream_results():
+        try:
+            results.seek(0)
+            for line in results:
+                yield line
+            yield json.dumps({"summary": summary}) + '\n'
+        finally:
+            results.close()
+
+    return StreamingResponse(stream_results(), status_code=status_code, media_type="application/x-ndjson")
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from app.utils.aws_operations import add_item_to_dynamodb
+from app.utils.rate_limiter import ThrottlingError
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
 @router.post("/sample")
-async def add_sample_data():
+def add_sample_data():
     """
     Add a sample candidate record to DynamoDB
     """
@@ -39,5 +40,7 @@ async def add_sample_data():
             "data": sample_data
         }
         
+    except ThrottlingError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
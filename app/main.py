@@ -1,11 +1,30 @@
+import asyncio
+import math
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.controllers import candidate_controller, sample_controller
-from app.routes import questions
+from app.controllers import candidate_controller, sample_controller, ingest_controller
+from app.routes import questions, metrics
+from app.utils.aws_operations import warm_up_connections
+from app.utils.rate_limiter import ThrottlingError
 
-app = FastAPI(title="Candidate Management API")
+# Seconds a worker waits for warm-up before serving anyway; well below gunicorn's 30s worker timeout
+WARM_UP_TIMEOUT = float(os.getenv('WARM_UP_TIMEOUT', 5))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in every worker before it starts accepting connections
+    try:
+        if await asyncio.wait_for(asyncio.to_thread(warm_up_connections), WARM_UP_TIMEOUT):
+            print("AWS connections warmed up")
+    except asyncio.TimeoutError:
+        # The AWS clients use 60s timeouts; the warm-up thread finishes in the background
+        print(f"AWS warm-up did not finish within {WARM_UP_TIMEOUT}s, starting anyway")
+    yield
+
+app = FastAPI(title="Candidate Management API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -16,6 +35,17 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@app.exception_handler(ThrottlingError)
+async def throttling_exception_handler(request: Request, exc: ThrottlingError):
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+        content={
+            "error": "Throttled",
+            "message": str(exc)
+        }
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
@@ -29,9 +59,14 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(candidate_controller.router, prefix="/api/v1")
 app.include_router(sample_controller.router, prefix="/api/v1", tags=["sample"])
+app.include_router(ingest_controller.router, prefix="/api/v1", tags=["ingest"])
 app.include_router(questions.router, prefix="/api/v1", tags=["questions"])
+app.include_router(metrics.router, prefix="/api/v1", tags=["metrics"])
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
 
 if __name__ == "__main__":
-    import uvicorn
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
+    from app.server import main
+    main()
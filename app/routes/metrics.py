@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from app.utils.rate_limiter import get_throttle_metrics
+
+router = APIRouter()
+
+@router.get("/metrics/throttling")
+async def throttling_metrics():
+    """
+    Request, throttling and consumed capacity counters with the current
+    adaptive rate for each table/bucket and operation type
+    """
+    return {"limiters": get_throttle_metrics()}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.utils.aws_operations import get_candidate, get_json_from_s3, S3_BUCKET_NAME
 from app.utils.llm_operations import generate_interview_questions
+from app.utils.rate_limiter import ThrottlingError
 
 router = APIRouter()
 
@@ -10,7 +11,7 @@ class QuestionRequest(BaseModel):
     candidate_id: str
 
 @router.post("/questions")
-async def generate_questions(request: QuestionRequest):
+def generate_questions(request: QuestionRequest):
     try:
         # Get candidate details from DynamoDB
         candidate = get_candidate(request.job_id, request.candidate_id)
@@ -62,6 +63,8 @@ async def generate_questions(request: QuestionRequest):
         
         return {"questions": questions}
         
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error in generate_questions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
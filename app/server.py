@@ -0,0 +1,93 @@
+import argparse
+import importlib.util
+import multiprocessing
+import os
+
+APP_IMPORT_PATH = "app.main:app"
+
+def default_workers():
+    """
+    Number of worker processes when WEB_CONCURRENCY is not set: one per CPU
+    """
+    return int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+def _fast_loop():
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+def _fast_http():
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+def run_development(host, port):
+    import uvicorn
+    uvicorn.run(APP_IMPORT_PATH, host=host, port=port, reload=True)
+
+def run_production(host, port, workers=None, preload=False, graceful_timeout=30):
+    """
+    Serve the app with multiple worker processes
+
+    With preload the app is imported once in a gunicorn master before
+    forking (when gunicorn is installed). Otherwise uvicorn's own process
+    manager is used. Each worker warms up its AWS clients during startup,
+    before it accepts traffic, and drains in-flight requests for up to
+    graceful_timeout seconds on shutdown.
+    """
+    workers = workers or default_workers()
+    loop, http = _fast_loop(), _fast_http()
+    print(f"Starting {workers} workers on {host}:{port} (loop={loop}, http={http}, preload={preload})")
+
+    if preload:
+        if importlib.util.find_spec("gunicorn"):
+            _run_gunicorn(host, port, workers, graceful_timeout)
+            return
+        print("Warning: gunicorn is not installed, starting without app preload")
+
+    import uvicorn
+    uvicorn.run(
+        APP_IMPORT_PATH,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        access_log=False,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
+
+def _run_gunicorn(host, port, workers, graceful_timeout):
+    from gunicorn.app.base import BaseApplication
+    from app.main import app
+
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("graceful_timeout", graceful_timeout)
+
+        def load(self):
+            return app
+
+    PreloadedApplication().run()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Candidate Management API")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--production", action="store_true", default=os.getenv("APP_ENV") == "production",
+                        help="Run multiple worker processes without auto-reload")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes in production mode (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument("--preload", action="store_true", default=os.getenv("PRELOAD_APP") == "1",
+                        help="Import the app once before forking workers (requires gunicorn)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+                        help="Seconds to let in-flight requests finish on shutdown")
+    args = parser.parse_args(argv)
+
+    if args.production:
+        run_production(args.host, args.port, args.workers, args.preload, args.graceful_timeout)
+    else:
+        run_development(args.host, args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
 import boto3
 import json
 import os
+import random
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
+from urllib.parse import unquote, urlparse
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
+from app.utils.rate_limiter import ThrottlingError, call_with_backoff, record_metric, get_rate_limiter
 
 # Load environment variables
 load_dotenv()
@@ -32,6 +41,70 @@ session = boto3.Session(
     region_name=aws_region
 )
 
+# Retries are handled by call_with_backoff so they share the adaptive rate limiters
+AWS_CLIENT_CONFIG = Config(
+    retries={'mode': 'standard', 'max_attempts': 1},
+    max_pool_connections=int(os.getenv('AWS_MAX_POOL_CONNECTIONS', 50))
+)
+
+# boto3 sessions are not thread-safe when creating clients/resources
+_session_lock = threading.Lock()
+
+# Maximum number of put requests DynamoDB accepts in one BatchWriteItem call
+DYNAMODB_BATCH_SIZE = 25
+
+# Sort key of the per-job item holding the candidate list change counter
+JOB_VERSION_SORT_KEY = '#version'
+
+# Object probed at startup to open the S3 connection pool; it doesn't need to exist
+WARM_UP_S3_KEY = '.warm-up'
+
+# Presigned URL lifetime and how long before expiry a cached URL is re-signed
+PRESIGNED_URL_EXPIRY = int(os.getenv('PRESIGNED_URL_EXPIRY', 3600))
+PRESIGNED_URL_REFRESH_MARGIN = int(os.getenv('PRESIGNED_URL_REFRESH_MARGIN', 300))
+PRESIGNED_URL_CACHE_SIZE = 10000
+if PRESIGNED_URL_EXPIRY <= PRESIGNED_URL_REFRESH_MARGIN:
+    raise EnvironmentError("PRESIGNED_URL_EXPIRY must be greater than PRESIGNED_URL_REFRESH_MARGIN")
+
+# (bucket, key) -> (url, expires_at, epoch), least recently used first
+_presigned_url_cache = OrderedDict()
+_presigned_url_lock = threading.Lock()
+
+# Shared per process so every request reuses the same connection pools.
+# Only low-level clients are cached: unlike resources they are thread-safe.
+_aws_clients = {}
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+def serialize_item(item):
+    """
+    Convert a Python dict to DynamoDB's attribute value format
+    """
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+def deserialize_item(item):
+    """
+    Convert an item in DynamoDB's attribute value format to a Python dict
+    """
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+def _get_cached(name, factory):
+    client = _aws_clients.get(name)
+    if client is None:
+        with _session_lock:
+            client = _aws_clients.get(name)
+            if client is None:
+                client = factory()
+                _aws_clients[name] = client
+    return client
+
+def get_dynamodb_client():
+    return _get_cached('dynamodb_client', lambda: session.client('dynamodb', config=AWS_CLIENT_CONFIG))
+
+def get_s3_client():
+    return _get_cached('s3_client', lambda: session.client('s3', config=AWS_CLIENT_CONFIG))
+
 def get_json_from_s3(bucket_name, key):
     """
     Fetch JSON content from S3 bucket
@@ -42,12 +115,17 @@ def get_json_from_s3(bucket_name, key):
         
     Returns:
         dict: Parsed JSON content or None if error
+        
+    Raises:
+        ThrottlingError: If S3 keeps throttling the request past the retry budget
     """
     try:
-        s3 = session.client('s3')
-        response = s3.get_object(Bucket=bucket_name, Key=key)
+        s3 = get_s3_client()
+        response = call_with_backoff(bucket_name, 'read', s3.get_object, Bucket=bucket_name, Key=key)
         content = response['Body'].read().decode('utf-8')
         return json.loads(content)
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error fetching JSON from S3: {str(e)}")
         return None
@@ -63,9 +141,12 @@ def upload_to_s3(bucket_name, file_content, key):
         
     Returns:
         bool: True if successful, False otherwise
+        
+    Raises:
+        ThrottlingError: If S3 keeps throttling the request past the retry budget
     """
     try:
-        s3 = session.client('s3')
+        s3 = get_s3_client()
         
         # Handle different input types and ensure valid JSON
         if isinstance(file_content, dict):
@@ -84,7 +165,8 @@ def upload_to_s3(bucket_name, file_content, key):
             return False
         
         # Upload to S3
-        s3.put_object(
+        call_with_backoff(
+            bucket_name, 'write', s3.put_object,
             Bucket=bucket_name,
             Key=key,
             Body=json_content,
@@ -92,6 +174,8 @@ def upload_to_s3(bucket_name, file_content, key):
         )
         
         return True
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error uploading to S3: {str(e)}")
         return False
@@ -108,43 +192,54 @@ def get_candidates_by_score_range(min_score=0, max_score=100, status='IN_CONSIDE
         
     Returns:
         list: List of candidate items matching the score range and status
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
-        dynamodb = session.resource('dynamodb')
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE_NAME'))
+        dynamodb = get_dynamodb_client()
+        table_name = os.getenv('DYNAMODB_TABLE_NAME')
         
         # Create filter expression for score range and status
         filter_expression = 'attribute_exists(absolute_score) AND absolute_score BETWEEN :min_score AND :max_score AND #status = :status'
-        expression_values = {
+        expression_values = serialize_item({
             ':min_score': min_score,
             ':max_score': max_score,
             ':status': status
-        }
+        })
         expression_names = {
             '#status': 'status'  # status is a reserved word in DynamoDB
         }
         
         # Query the table
-        response = table.scan(
+        response = call_with_backoff(
+            table_name, 'read', dynamodb.scan,
+            TableName=table_name,
             FilterExpression=filter_expression,
             ExpressionAttributeValues=expression_values,
-            ExpressionAttributeNames=expression_names
+            ExpressionAttributeNames=expression_names,
+            ReturnConsumedCapacity='TOTAL'
         )
         
         # Get all items
-        items = response.get('Items', [])
+        items = [deserialize_item(item) for item in response.get('Items', [])]
         
         # Handle pagination if there are more results
         while 'LastEvaluatedKey' in response:
-            response = table.scan(
+            response = call_with_backoff(
+                table_name, 'read', dynamodb.scan,
+                TableName=table_name,
                 FilterExpression=filter_expression,
                 ExpressionAttributeValues=expression_values,
                 ExpressionAttributeNames=expression_names,
-                ExclusiveStartKey=response['LastEvaluatedKey']
+                ExclusiveStartKey=response['LastEvaluatedKey'],
+                ReturnConsumedCapacity='TOTAL'
             )
-            items.extend(response.get('Items', []))
+            items.extend(deserialize_item(item) for item in response.get('Items', []))
         
         return items
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error querying DynamoDB: {str(e)}")
         return []
@@ -159,20 +254,29 @@ def get_candidate(job_id, candidate_id):
         
     Returns:
         dict: The candidate item if found, None otherwise
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
-        dynamodb = session.resource('dynamodb')
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE_NAME'))
+        dynamodb = get_dynamodb_client()
+        table_name = os.getenv('DYNAMODB_TABLE_NAME')
         
-        response = table.get_item(
+        response = call_with_backoff(
+            table_name, 'read', dynamodb.get_item,
+            TableName=table_name,
             Key={
-                'job_id': job_id,
-                'candidate_id': candidate_id
-            }
+                'job_id': {'S': job_id},
+                'candidate_id': {'S': candidate_id}
+            },
+            ReturnConsumedCapacity='TOTAL'
         )
-        print(response.get('Item'))
+        item = deserialize_item(response['Item']) if 'Item' in response else None
+        print(item)
         
-        return response.get('Item')
+        return item
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error getting candidate: {str(e)}")
         return None
@@ -189,6 +293,9 @@ def update_candidate_verdict(job_id, candidate_id, status, verdict_comment):
         
     Returns:
         tuple: (bool, str) - (success, error_message)
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
         # First check if the candidate exists
@@ -196,10 +303,11 @@ def update_candidate_verdict(job_id, candidate_id, status, verdict_comment):
         if not candidate:
             return False, f"Candidate not found with job_id: {job_id} and candidate_id: {candidate_id}"
         
-        dynamodb = session.client('dynamodb')
+        dynamodb = get_dynamodb_client()
         
         # Update the item using the client
-        response = dynamodb.update_item(
+        response = call_with_backoff(
+            DYNAMODB_TABLE_NAME, 'write', dynamodb.update_item,
             TableName=os.getenv('DYNAMODB_TABLE_NAME'),
             Key={
                 'job_id': {'S': job_id},
@@ -213,10 +321,15 @@ def update_candidate_verdict(job_id, candidate_id, status, verdict_comment):
                 ':s': {'S': status},
                 ':c': {'S': verdict_comment}
             },
-            ReturnValues='UPDATED_NEW'
+            ReturnValues='UPDATED_NEW',
+            ReturnConsumedCapacity='TOTAL'
         )
+        if not bump_job_version(job_id):
+            return False, f"Candidate status updated but the change counter for job_id: {job_id} could not be bumped"
         
         return True, "Success"
+    except ThrottlingError:
+        raise
     except Exception as e:
         error_msg = f"Error updating candidate status: {str(e)}"
         print(error_msg)
@@ -231,18 +344,135 @@ def add_item_to_dynamodb(item):
         
     Returns:
         bool: True if successful, False otherwise
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
-        dynamodb = session.resource('dynamodb')
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE_NAME'))
+        dynamodb = get_dynamodb_client()
+        table_name = os.getenv('DYNAMODB_TABLE_NAME')
         
         # Add the item to the table
-        table.put_item(Item=item)
+        call_with_backoff(
+            table_name, 'write', dynamodb.put_item,
+            TableName=table_name,
+            Item=serialize_item(item),
+            ReturnConsumedCapacity='TOTAL'
+        )
+        if item.get('job_id') and not bump_job_version(item['job_id']):
+            return False
         return True
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error adding item to DynamoDB: {str(e)}")
         return False
 
+def batch_write_items_to_dynamodb(items, max_retries=5, base_delay=0.05, max_delay=2.0):
+    """
+    Write a batch of items to DynamoDB with a single BatchWriteItem request,
+    retrying unprocessed items with jittered exponential backoff
+    
+    If DynamoDB rejects the whole request as invalid, the items are written
+    one by one so only the offending items fail.
+    
+    Args:
+        items (list): The items to write (at most DYNAMODB_BATCH_SIZE, unique keys)
+        max_retries (int): Maximum number of retries for unprocessed items
+        base_delay (float): Initial backoff delay in seconds
+        max_delay (float): Upper bound for a single backoff delay in seconds
+        
+    Returns:
+        list: (item, error_message) for every item that could not be written
+    """
+    failed = []
+    requests = []
+    serialized_items = []
+    for item in items:
+        try:
+            requests.append({'PutRequest': {'Item': serialize_item(item)}})
+            serialized_items.append(item)
+        except Exception as e:
+            failed.append((item, f"Error serializing item: {str(e)}"))
+    if not requests:
+        return failed
+    
+    attempt = 0
+    try:
+        dynamodb = get_dynamodb_client()
+        while requests:
+            response = call_with_backoff(
+                DYNAMODB_TABLE_NAME, 'write', dynamodb.batch_write_item,
+                tokens=len(requests),
+                RequestItems={DYNAMODB_TABLE_NAME: requests},
+                ReturnConsumedCapacity='TOTAL'
+            )
+            requests = response.get('UnprocessedItems', {}).get(DYNAMODB_TABLE_NAME, [])
+            if not requests or attempt >= max_retries:
+                break
+            
+            # Unprocessed items mean the table is throttling part of the batch
+            get_rate_limiter(DYNAMODB_TABLE_NAME, 'write').on_throttle()
+            record_metric(DYNAMODB_TABLE_NAME, 'write', 'throttled')
+            
+            # Back off before resubmitting whatever DynamoDB did not process
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            time.sleep(random.uniform(0, delay))
+            attempt += 1
+        
+        unprocessed = [deserialize_item(request['PutRequest']['Item']) for request in requests]
+        if len(unprocessed) < len(serialized_items):
+            bump_error = _bump_job_versions(serialized_items)
+            if bump_error:
+                # Report the rows as failed so the caller retries them and the counter moves
+                return failed + [(item, bump_error) for item in serialized_items]
+        error_msg = f"Unprocessed after {max_retries} retries"
+        return failed + [(item, error_msg) for item in unprocessed]
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ValidationException' or attempt > 0:
+            return failed + _batch_write_error(serialized_items, e)
+        # One invalid item fails the whole request, so find it by writing individually
+        return failed + _put_items_individually(serialized_items)
+    except Exception as e:
+        return failed + _batch_write_error(serialized_items, e)
+
+def _batch_write_error(items, error):
+    error_msg = f"Error batch writing items to DynamoDB: {str(error)}"
+    print(error_msg)
+    # Earlier attempts may have written part of the batch
+    bump_error = _bump_job_versions(items)
+    if bump_error:
+        error_msg = f"{error_msg}; {bump_error}"
+    return [(item, error_msg) for item in items]
+
+def _put_items_individually(items):
+    """
+    Write items one PutItem at a time
+
+    Returns:
+        list: (item, error_message) for every item that could not be written
+    """
+    dynamodb = get_dynamodb_client()
+    failed = []
+    written = []
+    for item in items:
+        try:
+            call_with_backoff(
+                DYNAMODB_TABLE_NAME, 'write', dynamodb.put_item,
+                TableName=DYNAMODB_TABLE_NAME,
+                Item=serialize_item(item),
+                ReturnConsumedCapacity='TOTAL'
+            )
+            written.append(item)
+        except Exception as e:
+            failed.append((item, f"Error adding item to DynamoDB: {str(e)}"))
+    
+    if written:
+        bump_error = _bump_job_versions(written)
+        if bump_error:
+            failed.extend((item, bump_error) for item in written)
+    return failed
+
 def get_all_candidates_by_job_id(job_id):
     """
     Get all candidates from DynamoDB for a specific job_id, sorted by:
@@ -258,6 +488,9 @@ def get_all_candidates_by_job_id(job_id):
         
     Returns:
         list: List of candidate items for the specified job, sorted by scores
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
         # Validate AWS configuration
@@ -269,45 +502,50 @@ def get_all_candidates_by_job_id(job_id):
         print(f"Using DynamoDB table: {DYNAMODB_TABLE_NAME}")
         print(f"AWS Region: {aws_region}")
         
-        dynamodb = session.resource('dynamodb')
-        table = dynamodb.Table(DYNAMODB_TABLE_NAME)
+        dynamodb = get_dynamodb_client()
         
         # Query the table using job_id as the partition key and filter by status
         print("Executing DynamoDB query...")
-        response = table.query(
+        response = call_with_backoff(
+            DYNAMODB_TABLE_NAME, 'read', dynamodb.query,
+            TableName=DYNAMODB_TABLE_NAME,
             KeyConditionExpression='job_id = :job_id',
             FilterExpression='#status IN (:status1, :status2)',
             ExpressionAttributeNames={
                 '#status': 'status'  # status is a reserved word in DynamoDB
             },
             ExpressionAttributeValues={
-                ':job_id': job_id,
-                ':status1': 'ACCEPTED',
-                ':status2': 'IN_CONSIDERATION'
-            }
+                ':job_id': {'S': job_id},
+                ':status1': {'S': 'ACCEPTED'},
+                ':status2': {'S': 'IN_CONSIDERATION'}
+            },
+            ReturnConsumedCapacity='TOTAL'
         )
         
         # Get all items
-        items = response.get('Items', [])
+        items = [deserialize_item(item) for item in response.get('Items', [])]
         print(f"Found {len(items)} candidates")
         
         # Handle pagination if there are more results
         while 'LastEvaluatedKey' in response:
             print("Fetching more results...")
-            response = table.query(
+            response = call_with_backoff(
+                DYNAMODB_TABLE_NAME, 'read', dynamodb.query,
+                TableName=DYNAMODB_TABLE_NAME,
                 KeyConditionExpression='job_id = :job_id',
                 FilterExpression='#status IN (:status1, :status2)',
                 ExpressionAttributeNames={
                     '#status': 'status'
                 },
                 ExpressionAttributeValues={
-                    ':job_id': job_id,
-                    ':status1': 'ACCEPTED',
-                    ':status2': 'IN_CONSIDERATION'
+                    ':job_id': {'S': job_id},
+                    ':status1': {'S': 'ACCEPTED'},
+                    ':status2': {'S': 'IN_CONSIDERATION'}
                 },
-                ExclusiveStartKey=response['LastEvaluatedKey']
+                ExclusiveStartKey=response['LastEvaluatedKey'],
+                ReturnConsumedCapacity='TOTAL'
             )
-            items.extend(response.get('Items', []))
+            items.extend(deserialize_item(item) for item in response.get('Items', []))
             print(f"Total candidates found: {len(items)}")
         
         if not items:
@@ -328,6 +566,8 @@ def get_all_candidates_by_job_id(job_id):
         
         print(f"Sorted {len(sorted_items)} candidates by scores")
         return sorted_items
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"❌ Error querying DynamoDB: {str(e)}")
         print(f"Error type: {type(e)}")
@@ -335,6 +575,98 @@ def get_all_candidates_by_job_id(job_id):
         print(f"Traceback: {traceback.format_exc()}")
         return None
 
+def get_job_version(job_id):
+    """
+    Get the change counter for a job's candidate list
+    
+    The counter is stored in its own item under JOB_VERSION_SORT_KEY and is
+    bumped by every write to the job's candidates, so callers can tell whether
+    the list changed without querying it.
+    
+    Args:
+        job_id (str): The job ID (partition key)
+        
+    Returns:
+        int: The current version (0 if the job was never written), None if error
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
+    """
+    try:
+        dynamodb = get_dynamodb_client()
+        response = call_with_backoff(
+            DYNAMODB_TABLE_NAME, 'read', dynamodb.get_item,
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={
+                'job_id': {'S': job_id},
+                'candidate_id': {'S': JOB_VERSION_SORT_KEY}
+            },
+            ConsistentRead=True,
+            ReturnConsumedCapacity='TOTAL'
+        )
+        return int(response.get('Item', {}).get('version', {}).get('N', 0))
+    except ThrottlingError:
+        raise
+    except Exception as e:
+        print(f"Error getting job version: {str(e)}")
+        return None
+
+def bump_job_version(job_id):
+    """
+    Atomically increment the change counter for a job's candidate list
+    
+    Args:
+        job_id (str): The job ID (partition key)
+        
+    Returns:
+        bool: True if successful, False otherwise
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
+    """
+    try:
+        dynamodb = get_dynamodb_client()
+        call_with_backoff(
+            DYNAMODB_TABLE_NAME, 'write', dynamodb.update_item,
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={
+                'job_id': {'S': job_id},
+                'candidate_id': {'S': JOB_VERSION_SORT_KEY}
+            },
+            UpdateExpression='ADD version :one',
+            ExpressionAttributeValues={
+                ':one': {'N': '1'}
+            },
+            ReturnConsumedCapacity='TOTAL'
+        )
+        return True
+    except ThrottlingError:
+        record_metric(DYNAMODB_TABLE_NAME, 'write', 'version_bump_failures')
+        raise
+    except Exception as e:
+        # A missed bump lets pollers keep getting 304 for stale data, so make it visible
+        record_metric(DYNAMODB_TABLE_NAME, 'write', 'version_bump_failures')
+        print(f"❌ Error bumping job version for job_id {job_id}, candidate list ETags are stale: {str(e)}")
+        return False
+
+def _bump_job_versions(items):
+    """
+    Bump the change counter of every job in a batch of written items
+
+    Returns:
+        str: Error message if any bump failed, None otherwise
+    """
+    failed = []
+    for job_id in sorted({item['job_id'] for item in items if item.get('job_id')}):
+        try:
+            if not bump_job_version(job_id):
+                failed.append(job_id)
+        except ThrottlingError as e:
+            failed.append(f"{job_id} ({str(e)})")
+    if failed:
+        return f"Items written but the change counter could not be bumped for jobs: {', '.join(failed)}"
+    return None
+
 def update_candidate_questions(job_id, candidate_id, questions_key):
     """
     Update a candidate's questions key in DynamoDB
@@ -346,12 +678,16 @@ def update_candidate_questions(job_id, candidate_id, questions_key):
         
     Returns:
         bool: True if successful, False otherwise
+        
+    Raises:
+        ThrottlingError: If DynamoDB keeps throttling the request past the retry budget
     """
     try:
-        dynamodb = session.client('dynamodb')
+        dynamodb = get_dynamodb_client()
         
         # Update the item using the client
-        response = dynamodb.update_item(
+        response = call_with_backoff(
+            DYNAMODB_TABLE_NAME, 'write', dynamodb.update_item,
             TableName=os.getenv('DYNAMODB_TABLE_NAME'),
             Key={
                 'job_id': {'S': job_id},
@@ -361,10 +697,12 @@ def update_candidate_questions(job_id, candidate_id, questions_key):
             ExpressionAttributeValues={
                 ':q': {'S': questions_key}
             },
-            ReturnValues='UPDATED_NEW'
+            ReturnValues='UPDATED_NEW',
+            ReturnConsumedCapacity='TOTAL'
         )
-        
-        return True
+        return bump_job_version(job_id)
+    except ThrottlingError:
+        raise
     except Exception as e:
         print(f"Error updating candidate questions: {str(e)}")
         return False
@@ -375,4 +713,215 @@ def s3_key_to_url(key, bucket_name=None, region=None):
     if region == "us-east-1":
         return f"https://{bucket}.s3.amazonaws.com/{key}"
     else:
-        return f"https://{bucket}.s3.{region}.amazonaws.com/{key}" 
\ No newline at end of file
+        return f"https://{bucket}.s3.{region}.amazonaws.com/{key}" 
+
+def s3_url_to_key(value, bucket_name=None):
+    """
+    Convert a stored S3 reference to an object key
+
+    Args:
+        value (str): An object key, or a URL previously built by s3_key_to_url
+        bucket_name (str): Name of the S3 bucket (default: S3_BUCKET_NAME)
+
+    Returns:
+        str: The object key, or None if value is empty or points at another bucket
+    """
+    if not value:
+        return None
+    if not value.startswith(('http://', 'https://')):
+        return value
+
+    bucket = bucket_name or S3_BUCKET_NAME
+    parsed = urlparse(value)
+    host = parsed.netloc.lower()
+    path = unquote(parsed.path.lstrip('/'))
+    s3_hosts = [f"s3.{aws_region}.amazonaws.com", f"s3-{aws_region}.amazonaws.com", "s3.amazonaws.com"]
+
+    # Path-style URL: https://s3.<region>.amazonaws.com/<bucket>/<key>
+    if host in s3_hosts:
+        prefix = f"{bucket}/"
+        if not path.startswith(prefix):
+            return None
+        return path[len(prefix):] or None
+
+    # Virtual-hosted URL: bucket names may contain dots, so strip the known suffix
+    for s3_host in s3_hosts:
+        if host.endswith(f".{s3_host}"):
+            if host[:-len(s3_host) - 1] != bucket.lower():
+                return None
+            return path or None
+    return None
+
+def _get_s3_signer():
+    return _get_cached('s3_signer', lambda: session.client(
+        's3',
+        region_name=aws_region,
+        config=Config(signature_version='s3v4', s3={'addressing_style': 'virtual'})
+    ))
+
+def presigned_url_epoch(now=None):
+    """
+    Index of the current presigned URL signing window
+
+    Cached URLs are only reused within the window they were signed in. A
+    window is PRESIGNED_URL_EXPIRY - PRESIGNED_URL_REFRESH_MARGIN seconds
+    long, so every URL handed out during a window stays valid for at least
+    PRESIGNED_URL_REFRESH_MARGIN seconds after the window ends, unless
+    the signing credentials expire sooner (see presigned_url_cache_tag).
+    """
+    window = max(1, PRESIGNED_URL_EXPIRY - PRESIGNED_URL_REFRESH_MARGIN)
+    return int((now or time.time()) // window)
+
+def _credential_expiry():
+    """
+    Unix time at which the session credentials expire, or None if they don't
+
+    Refreshable credentials (instance/role providers) report their own
+    expiry; static temporary credentials passed through the environment can
+    declare it with AWS_CREDENTIAL_EXPIRATION (ISO 8601).
+    """
+    credentials = session.get_credentials()
+    if credentials is None:
+        return None
+    # Refreshes credentials that are about to expire, so the expiry read below is current
+    credentials.get_frozen_credentials()
+    expiry_time = getattr(credentials, '_expiry_time', None)
+    if expiry_time is not None:
+        return expiry_time.timestamp()
+
+    expiration = os.getenv('AWS_CREDENTIAL_EXPIRATION')
+    if expiration:
+        try:
+            return datetime.fromisoformat(expiration.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            print(f"Invalid AWS_CREDENTIAL_EXPIRATION: {expiration}")
+    return None
+
+def presigned_url_cache_tag(now=None):
+    """
+    ETag component for responses that embed presigned URLs
+
+    Returns the signing window as 'e<epoch>' when URLs signed now stay valid
+    for PRESIGNED_URL_REFRESH_MARGIN seconds past the end of the window, so
+    a 304 can be answered for the whole window. Returns None when the
+    credential expiry cuts URL lifetimes shorter than that; such responses
+    must be tagged by their content instead.
+    """
+    now = now or time.time()
+    epoch = presigned_url_epoch(now)
+    credential_expiry = _credential_expiry()
+    if credential_expiry is not None:
+        window = max(1, PRESIGNED_URL_EXPIRY - PRESIGNED_URL_REFRESH_MARGIN)
+        if credential_expiry < (epoch + 1) * window + PRESIGNED_URL_REFRESH_MARGIN:
+            return None
+    return f"e{epoch}"
+
+def generate_presigned_urls(keys, bucket_name=None, expires_in=None):
+    """
+    Generate presigned GET URLs for a batch of S3 keys
+
+    Signing is done locally with the session credentials, so no request is
+    made to S3. URLs are cached and re-signed when a new signing window
+    starts (see presigned_url_epoch) or when they are within
+    PRESIGNED_URL_REFRESH_MARGIN seconds of expiring. A URL stops working
+    when the credentials that signed it expire, so its lifetime is capped
+    at the credential expiry.
+
+    Args:
+        keys (iterable): S3 object keys to sign (empty values are skipped)
+        bucket_name (str): Name of the S3 bucket (default: S3_BUCKET_NAME)
+        expires_in (int): URL lifetime in seconds (default: PRESIGNED_URL_EXPIRY)
+
+    Returns:
+        dict: Mapping of key to presigned URL for every key that could be signed
+    """
+    bucket = bucket_name or S3_BUCKET_NAME
+    expires_in = expires_in or PRESIGNED_URL_EXPIRY
+    now = time.time()
+    epoch = presigned_url_epoch(now)
+    urls = {}
+    missing = []
+
+    with _presigned_url_lock:
+        for key in set(filter(None, keys)):
+            cached = _presigned_url_cache.get((bucket, key))
+            if cached and cached[2] == epoch and cached[1] - now > PRESIGNED_URL_REFRESH_MARGIN:
+                _presigned_url_cache.move_to_end((bucket, key))
+                urls[key] = cached[0]
+            else:
+                missing.append(key)
+
+    if not missing:
+        return urls
+
+    expires_at = now + expires_in
+    credential_expiry = _credential_expiry()
+    if credential_expiry is not None and credential_expiry < expires_at:
+        expires_at = credential_expiry
+        expires_in = max(1, int(expires_at - now))
+
+    try:
+        s3 = _get_s3_signer()
+        signed = {
+            key: s3.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': bucket, 'Key': key},
+                ExpiresIn=expires_in
+            )
+            for key in missing
+        }
+    except Exception as e:
+        print(f"Error generating presigned URLs: {str(e)}")
+        return urls
+
+    with _presigned_url_lock:
+        for key, url in signed.items():
+            _presigned_url_cache[(bucket, key)] = (url, expires_at, epoch)
+            _presigned_url_cache.move_to_end((bucket, key))
+        while len(_presigned_url_cache) > PRESIGNED_URL_CACHE_SIZE:
+            _presigned_url_cache.popitem(last=False)
+
+    urls.update(signed)
+    return urls
+
+def warm_up_connections():
+    """
+    Open the DynamoDB and S3 connection pools and prime the presigned URL
+    signer and rate limiters, so a worker's first requests don't pay the
+    client setup and TLS handshake cost
+
+    Returns:
+        bool: True if both services answered, False otherwise
+    """
+    get_rate_limiter(DYNAMODB_TABLE_NAME, 'read')
+    get_rate_limiter(DYNAMODB_TABLE_NAME, 'write')
+    get_rate_limiter(S3_BUCKET_NAME, 'read')
+    get_rate_limiter(S3_BUCKET_NAME, 'write')
+    _get_s3_signer()
+    
+    # Each service is warmed up on its own so one failure doesn't leave the other pool cold.
+    # An error response from AWS (e.g. a missing key) still means the connection is open.
+    dynamodb_ready = s3_ready = False
+    try:
+        # A point read on the version key needs no permission the app doesn't already use
+        get_dynamodb_client().get_item(
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={
+                'job_id': {'S': JOB_VERSION_SORT_KEY},
+                'candidate_id': {'S': JOB_VERSION_SORT_KEY}
+            }
+        )
+        dynamodb_ready = True
+    except ClientError:
+        dynamodb_ready = True
+    except Exception as e:
+        print(f"Error warming up DynamoDB connections: {str(e)}")
+    try:
+        # HeadObject only needs s3:GetObject, which the app already uses; head_bucket would need s3:ListBucket
+        get_s3_client().head_object(Bucket=S3_BUCKET_NAME, Key=WARM_UP_S3_KEY)
+        s3_ready = True
+    except ClientError:
+        s3_ready = True
+    except Exception as e:
+        print(f"Error warming up S3 connections: {str(e)}")
+    return dynamodb_ready and s3_ready
@@ -0,0 +1,72 @@
+import gzip
+import hashlib
+import os
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Response bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+
+def content_etag(body):
+    """
+    Weak ETag derived from a hash of the serialized response body
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(request: Request, etag):
+    """
+    Check the request's If-None-Match header against an ETag (weak comparison)
+    """
+    header = request.headers.get('if-none-match')
+    if not header or not etag:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag.removeprefix('W/') in candidates
+
+def not_modified_response(etag):
+    return Response(status_code=304, headers={'ETag': etag, 'Vary': 'Accept-Encoding'})
+
+def _accepted_encodings(request: Request):
+    encodings = set()
+    for part in request.headers.get('accept-encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+def json_response(request: Request, body, etag=None):
+    """
+    Build a JSON response from already serialized bytes, answering
+    If-None-Match with 304 and compressing large bodies with brotli
+    (when installed) or gzip depending on Accept-Encoding
+
+    Args:
+        request (Request): The incoming request
+        body (bytes): Serialized JSON body
+        etag (str): ETag for the body, computed from its content if omitted
+
+    Returns:
+        Response: 304, or 200 with the (possibly compressed) body
+    """
+    etag = etag or content_etag(body)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        encodings = _accepted_encodings(request)
+        if brotli is not None and 'br' in encodings:
+            body = brotli.compress(body, quality=5)
+            headers['Content-Encoding'] = 'br'
+        elif 'gzip' in encodings:
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+
+    return Response(content=body, media_type='application/json', headers=headers)
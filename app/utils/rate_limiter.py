@@ -0,0 +1,252 @@
+import os
+import random
+import threading
+import time
+from collections import Counter
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+# Error codes AWS uses to signal that a request was throttled
+THROTTLING_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'Throttling',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'SlowDown',
+}
+
+# Server-side errors that are worth retrying but say nothing about our request rate
+TRANSIENT_ERROR_CODES = {
+    'InternalServerError',
+    'InternalError',
+    'ServiceUnavailable',
+}
+
+# Network failures botocore used to retry before call_with_backoff took over retries
+TRANSIENT_CONNECTION_ERRORS = (
+    EndpointConnectionError,
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    ReadTimeoutError,
+)
+
+# Starting request rates (tokens per second) for each operation type
+DEFAULT_RATES = {
+    'read': float(os.getenv('AWS_READ_RATE_LIMIT', 100)),
+    'write': float(os.getenv('AWS_WRITE_RATE_LIMIT', 50)),
+}
+
+# Total time a single call may spend waiting for tokens and retrying throttled requests
+DEFAULT_TIME_BUDGET = float(os.getenv('AWS_RETRY_TIME_BUDGET', 10))
+
+class ThrottlingError(Exception):
+    """
+    Raised when a request keeps being throttled until its retry time budget runs out
+    """
+    def __init__(self, resource, operation_type, attempts, retry_after):
+        self.resource = resource
+        self.operation_type = operation_type
+        self.attempts = attempts
+        self.retry_after = retry_after
+        super().__init__(
+            f"Throttled on {resource} ({operation_type}) after {attempts} attempts, retry after {retry_after:.1f}s"
+        )
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose refill rate adapts to throttling.
+
+    The rate is halved whenever the service throttles us and grows back
+    additively after each successful request (AIMD). Tokens may go negative
+    when a request consumes more capacity than it reserved, which delays
+    the following requests until the debt is refilled.
+    """
+    def __init__(self, rate, min_rate=1.0, max_rate=None, increase=1.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.increase = increase
+        self.tokens = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        # Capacity is one second worth of tokens
+        self.tokens = min(self.rate, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, tokens=1.0, timeout=None):
+        """
+        Block until `tokens` are available
+
+        Args:
+            tokens (float): Number of tokens to take
+            timeout (float): Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            bool: True if the tokens were taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                # Requests larger than the bucket only need it to be full
+                needed = min(tokens, self.rate)
+                # Tolerate float rounding, otherwise waiting exactly `wait` can leave us a hair short forever
+                if self.tokens >= needed - 1e-9:
+                    self.tokens -= tokens
+                    return True
+                wait = (needed - self.tokens) / self.rate
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+    def charge(self, tokens):
+        """
+        Take additional tokens after the fact, e.g. for consumed capacity reported by DynamoDB
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+def get_rate_limiter(resource, operation_type):
+    """
+    Get the shared rate limiter for a table/bucket and operation type ('read' or 'write')
+    """
+    key = (resource, operation_type)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(DEFAULT_RATES[operation_type])
+            _limiters[key] = limiter
+        return limiter
+
+def record_metric(resource, operation_type, name, value=1):
+    with _metrics_lock:
+        _metrics[(resource, operation_type, name)] += value
+
+def get_throttle_metrics():
+    """
+    Snapshot of throttling counters and current rates per table/bucket and operation type
+
+    Returns:
+        list: One dict per (resource, operation_type) seen so far
+    """
+    with _metrics_lock:
+        counters = dict(_metrics)
+    with _limiters_lock:
+        limiters = dict(_limiters)
+
+    keys = {(resource, operation_type) for resource, operation_type, _ in counters} | set(limiters)
+    snapshot = []
+    for resource, operation_type in sorted(keys):
+        entry = {"resource": resource, "operation_type": operation_type}
+        for name in ('requests', 'throttled', 'throttle_errors', 'consumed_capacity', 'version_bump_failures'):
+            entry[name] = counters.get((resource, operation_type, name), 0)
+        if (resource, operation_type) in limiters:
+            entry["rate"] = round(limiters[(resource, operation_type)].rate, 2)
+        snapshot.append(entry)
+    return snapshot
+
+def is_throttling_error(error):
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+def _is_transient_error(error):
+    if isinstance(error, TRANSIENT_CONNECTION_ERRORS):
+        return True
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in TRANSIENT_ERROR_CODES
+
+def consumed_capacity_units(response):
+    """
+    Total CapacityUnits from a DynamoDB response made with ReturnConsumedCapacity, or None
+    """
+    consumed = response.get('ConsumedCapacity') if isinstance(response, dict) else None
+    if consumed is None:
+        return None
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(entry.get('CapacityUnits', 0)) for entry in consumed)
+
+def call_with_backoff(resource, operation_type, operation, *args, tokens=1.0, time_budget=None,
+                      base_delay=0.05, max_delay=2.0, **kwargs):
+    """
+    Call an AWS operation through the shared rate limiter, retrying throttled
+    requests, transient server errors and dropped connections with jittered
+    exponential backoff
+
+    Args:
+        resource (str): Table or bucket name the limiter is keyed on
+        operation_type (str): 'read' or 'write'
+        operation (callable): The boto3 method to call with *args/**kwargs
+        tokens (float): Tokens to reserve before the call
+        time_budget (float): Total seconds to spend on waiting and retries
+        base_delay (float): Initial backoff delay in seconds
+        max_delay (float): Upper bound for a single backoff delay in seconds
+
+    Returns:
+        The operation's response
+
+    Raises:
+        ThrottlingError: If the request is still throttled when the time budget runs out
+    """
+    limiter = get_rate_limiter(resource, operation_type)
+    clock = limiter._clock
+    deadline = clock() + (DEFAULT_TIME_BUDGET if time_budget is None else time_budget)
+    attempt = 0
+
+    while True:
+        if not limiter.acquire(tokens, timeout=max(0.0, deadline - clock())):
+            record_metric(resource, operation_type, 'throttle_errors')
+            raise ThrottlingError(resource, operation_type, attempt, tokens / limiter.rate)
+
+        attempt += 1
+        record_metric(resource, operation_type, 'requests')
+        try:
+            response = operation(*args, **kwargs)
+        except (ClientError, *TRANSIENT_CONNECTION_ERRORS) as e:
+            throttled = is_throttling_error(e)
+            if not throttled and not _is_transient_error(e):
+                raise
+            if throttled:
+                limiter.on_throttle()
+                record_metric(resource, operation_type, 'throttled')
+
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if clock() + delay >= deadline:
+                if not throttled:
+                    raise
+                record_metric(resource, operation_type, 'throttle_errors')
+                raise ThrottlingError(resource, operation_type, attempt, max(delay, tokens / limiter.rate)) from e
+            limiter._sleep(delay)
+            continue
+
+        limiter.on_success()
+        consumed = consumed_capacity_units(response)
+        if consumed is not None:
+            record_metric(resource, operation_type, 'consumed_capacity', consumed)
+            if consumed > tokens:
+                limiter.charge(consumed - tokens)
+        return response
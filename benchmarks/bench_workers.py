@@ -0,0 +1,128 @@
+"""
+Measure API throughput in production mode for increasing worker counts.
+
+Starts `python -m app.server --production --workers N` for each N, waits
+until /health answers, then drives it with keep-alive HTTP clients running
+in separate processes and reports requests per second.
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --path /health
+
+Missing configuration variables are filled with placeholders. When no AWS
+credentials are configured, an unreachable local endpoint is also used so
+warm-up fails fast instead of calling AWS.
+"""
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLACEHOLDER_ENV = {
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark',
+    'AWS_REGION': 'us-east-1',
+    'S3_BUCKET_NAME': 'benchmark-bucket',
+    'DYNAMODB_TABLE_NAME': 'benchmark-table',
+    'OPENAI_API_KEY': 'benchmark',
+}
+
+def _client_loop(host, port, path, duration):
+    """
+    Send requests over one keep-alive connection until duration elapses
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    completed = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status < 500:
+                completed += 1
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+    connection.close()
+    return completed, errors
+
+def _wait_until_ready(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        connection = http.client.HTTPConnection(host, port, timeout=1)
+        try:
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.2)
+    return False
+
+def run(workers, args):
+    env = dict(os.environ)
+    if not (env.get('AWS_ACCESS_KEY_ID') and env.get('AWS_SECRET_ACCESS_KEY')):
+        env.setdefault('AWS_ENDPOINT_URL', 'http://127.0.0.1:9')
+    for var, value in PLACEHOLDER_ENV.items():
+        if not env.get(var):
+            env[var] = value
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'app.server', '--production', '--host', args.host,
+         '--port', str(args.port), '--workers', str(workers)],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not _wait_until_ready(args.host, args.port, args.startup_timeout):
+            raise RuntimeError(f"Server with {workers} workers did not become ready")
+
+        with ProcessPoolExecutor(max_workers=args.clients) as pool:
+            started = time.monotonic()
+            futures = [
+                pool.submit(_client_loop, args.host, args.port, args.path, args.duration)
+                for _ in range(args.clients)
+            ]
+            results = [future.result() for future in futures]
+            elapsed = time.monotonic() - started
+    finally:
+        # SIGTERM lets the workers drain gracefully
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    completed = sum(done for done, _ in results)
+    errors = sum(failed for _, failed in results)
+    return completed / elapsed, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=os.cpu_count() * 2)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--path', default='/health')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'errors':>7}")
+    baseline = None
+    for workers in args.workers:
+        throughput, errors = run(workers, args)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x {errors:>7}")
+
+if __name__ == '__main__':
+    main()
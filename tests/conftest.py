@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# aws_operations refuses to import without its configuration
+for var, value in {
+    'AWS_ACCESS_KEY_ID': 'test',
+    'AWS_SECRET_ACCESS_KEY': 'test',
+    'AWS_REGION': 'us-east-1',
+    'S3_BUCKET_NAME': 'test-bucket',
+    'DYNAMODB_TABLE_NAME': 'test-table',
+}.items():
+    os.environ.setdefault(var, value)
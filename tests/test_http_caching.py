@@ -0,0 +1,111 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.controllers import candidate_controller
+from app.utils import aws_operations, http_caching
+from app.utils.http_caching import COMPRESSION_MIN_SIZE, etag_matches, json_response
+
+
+def make_request(**headers):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize('header, matches', [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", W/"abc"', True),
+    ('*', True),
+    ('"other"', False),
+    ('', False),
+])
+def test_etag_matches_uses_weak_comparison(header, matches):
+    assert etag_matches(make_request(if_none_match=header), 'W/"abc"') is matches
+
+
+def test_small_bodies_are_not_compressed():
+    response = json_response(make_request(accept_encoding='gzip, br'), b'[]')
+
+    assert 'content-encoding' not in response.headers
+    assert response.headers['vary'] == 'Accept-Encoding'
+
+
+def test_large_bodies_are_gzipped_when_brotli_is_not_accepted():
+    body = json.dumps([{'name': 'x' * 10}] * COMPRESSION_MIN_SIZE).encode()
+
+    response = json_response(make_request(accept_encoding='gzip, br;q=0'), body)
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(response.body) == body
+
+
+def test_large_bodies_prefer_brotli(monkeypatch):
+    brotli = pytest.importorskip('brotli')
+    monkeypatch.setattr(http_caching, 'brotli', brotli)
+    body = json.dumps([{'name': 'x' * 10}] * COMPRESSION_MIN_SIZE).encode()
+
+    response = json_response(make_request(accept_encoding='gzip, br'), body)
+
+    assert response.headers['content-encoding'] == 'br'
+    assert brotli.decompress(response.body) == body
+
+
+def test_matching_etag_gets_304():
+    body = b'{"a": 1}'
+    etag = json_response(make_request(), body).headers['etag']
+
+    response = json_response(make_request(if_none_match=etag), body)
+
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv('AWS_CREDENTIAL_EXPIRATION', raising=False)
+    aws_operations._presigned_url_cache.clear()
+    app = FastAPI()
+    app.include_router(candidate_controller.router)
+    yield TestClient(app)
+    aws_operations._presigned_url_cache.clear()
+
+
+def test_get_all_candidates_answers_304_without_listing(client, monkeypatch):
+    candidates = [{'job_id': 'TL001', 'candidate_id': 'c1', 'name': 'Ann', 'email': 'a@example.com'}]
+    listed = []
+
+    def get_all_candidates_by_job_id(job_id):
+        listed.append(job_id)
+        return candidates
+
+    monkeypatch.setattr(candidate_controller, 'get_job_version', lambda job_id: 3)
+    monkeypatch.setattr(candidate_controller, 'get_all_candidates_by_job_id', get_all_candidates_by_job_id)
+
+    first = client.get('/candidates/getAllCandidates')
+    second = client.get('/candidates/getAllCandidates', headers={'If-None-Match': first.headers['etag']})
+
+    assert first.status_code == 200 and '-v3-' in first.headers['etag']
+    assert second.status_code == 304
+    assert listed == ['TL001']
+
+
+def test_get_all_candidates_changes_etag_with_version(client, monkeypatch):
+    version = [3]
+    monkeypatch.setattr(candidate_controller, 'get_job_version', lambda job_id: version[0])
+    monkeypatch.setattr(candidate_controller, 'get_all_candidates_by_job_id', lambda job_id: [])
+    etag = client.get('/candidates/getAllCandidates').headers['etag']
+
+    version[0] = 4
+    response = client.get('/candidates/getAllCandidates', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
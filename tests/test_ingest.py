@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.controllers import ingest_controller
+
+
+class RecordingBatchWriter:
+    """
+    Stand-in for batch_write_items_to_dynamodb that records each batch and
+    fails the candidates listed in `failing`
+    """
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(items)
+        return [(item, 'ValidationException') for item in items if item['candidate_id'] in self.failing]
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = RecordingBatchWriter()
+    monkeypatch.setattr(ingest_controller, 'batch_write_items_to_dynamodb', writer)
+    return writer
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ingest_controller.router)
+    return TestClient(app)
+
+
+def upload(client, body, **params):
+    response = client.post('/candidates/bulk', params=params, content=body.encode('utf-8'))
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return response, lines[:-1], lines[-1]['summary']
+
+
+def written_items(writer):
+    return [item for batch in writer.batches for item in batch]
+
+
+def test_ndjson_rows_are_parsed_and_rejected_individually(client, writer):
+    body = '\n'.join([
+        json.dumps({'candidate_id': 'c1', 'name': 'Ann', 'email': 'ann@example.com', 'jd_score': 7.5}),
+        '{not json',
+        '',
+        '[1, 2]',
+        json.dumps({'candidate_id': 'c2', 'name': 'Bo', 'email': 'bo@example.com'}),
+    ])
+
+    response, results, summary = upload(client, body, job_id='J1', format='ndjson')
+
+    assert response.status_code == 200
+    assert [result['status'] for result in results] == ['rejected', 'rejected', 'written', 'written']
+    assert summary['received'] == 4 and summary['written'] == 2 and summary['rejected'] == 2
+    first = written_items(writer)[0]
+    assert first['job_id'] == 'J1'
+    assert str(first['jd_score']) == '7.5' and not isinstance(first['jd_score'], float)
+
+
+def test_fields_read_back_by_the_api_are_validated(client, writer):
+    body = json.dumps({
+        'job_id': 'J1', 'candidate_id': 'c1', 'name': 'Ann', 'email': 'ann@example.com',
+        'custom_criteria_scores': 'oops',
+    })
+
+    _, results, summary = upload(client, body)
+
+    assert results[0]['status'] == 'rejected'
+    assert 'custom_criteria_scores' in results[0]['detail']
+    assert summary['written'] == 0 and writer.batches == []
+
+
+def test_csv_stray_quote_only_affects_its_own_cell(client, writer):
+    body = 'job_id,candidate_id,name,email\nJ1,c1,Bob 5\'11" tall,bob@example.com\nJ1,c2,Ann,ann@example.com\n'
+
+    _, results, summary = upload(client, body, format='csv')
+
+    assert [result['status'] for result in results] == ['written', 'written']
+    assert summary['rejected'] == 0
+    assert written_items(writer)[0]['name'] == 'Bob 5\'11" tall'
+
+
+def test_csv_multi_line_quoted_field_and_escaped_quotes(client, writer):
+    body = (
+        'job_id,candidate_id,name,email,verdict_comment\n'
+        'J1,c1,"Smith, ""Al""",al@example.com,"first line\nsecond line"\n'
+        'J1,c2,Ann,ann@example.com,\n'
+    )
+
+    _, results, _ = upload(client, body, format='csv')
+
+    assert [(result['row'], result['status']) for result in results] == [(1, 'written'), (2, 'written')]
+    first, second = written_items(writer)
+    assert first['name'] == 'Smith, "Al"'
+    assert first['verdict_comment'] == 'first line\nsecond line'
+    assert 'verdict_comment' not in second
+
+
+def test_csv_invalid_utf8_rejects_only_that_row(client, writer):
+    body = b'job_id,candidate_id,name,email\nJ1,c1,\xff\xfe,x@example.com\nJ1,c2,Ann,ann@example.com\n'
+
+    response = client.post('/candidates/bulk', params={'format': 'csv'}, content=body)
+    results = [json.loads(line) for line in response.text.splitlines()][:-1]
+
+    assert [result['status'] for result in results] == ['rejected', 'written']
+    assert 'UTF-8' in results[0]['detail']
+
+
+def test_repeated_key_starts_a_new_batch(client, writer):
+    rows = [
+        {'job_id': 'J1', 'candidate_id': 'c1', 'name': 'Ann', 'email': 'a@example.com'},
+        {'job_id': 'J1', 'candidate_id': 'c2', 'name': 'Bo', 'email': 'b@example.com'},
+        {'job_id': 'J1', 'candidate_id': 'c1', 'name': 'Ann B', 'email': 'a@example.com'},
+    ]
+
+    _, _, summary = upload(client, '\n'.join(json.dumps(row) for row in rows))
+
+    assert summary['written'] == 3
+    assert [[item['candidate_id'] for item in batch] for batch in writer.batches] == [['c1', 'c2'], ['c1']]
+
+
+def test_write_batch_maps_failures_back_to_their_rows(writer):
+    writer.failing = {'c2'}
+    batch = [
+        (1, {'job_id': 'J1', 'candidate_id': 'c1'}),
+        (2, {'job_id': 'J1', 'candidate_id': 'c2'}),
+        (3, {'job_id': 'J2', 'candidate_id': 'c1'}),
+    ]
+
+    results = asyncio.run(ingest_controller._write_batch(batch))
+
+    assert [(row_number, error) for row_number, _, error in results] == [
+        (1, None), (2, 'ValidationException'), (3, None)
+    ]
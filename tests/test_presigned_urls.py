@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.controllers import candidate_controller
+from app.utils import aws_operations
+from app.utils.aws_operations import generate_presigned_urls, presigned_url_cache_tag, s3_url_to_key
+
+WINDOW = aws_operations.PRESIGNED_URL_EXPIRY - aws_operations.PRESIGNED_URL_REFRESH_MARGIN
+
+
+class CountingSigner:
+    """
+    Wraps a real S3 client (signing is local) and counts generate_presigned_url calls
+    """
+    def __init__(self, client):
+        self.client = client
+        self.calls = 0
+
+    def generate_presigned_url(self, *args, **kwargs):
+        self.calls += 1
+        return self.client.generate_presigned_url(*args, **kwargs)
+
+
+@pytest.fixture
+def signer():
+    aws_operations._aws_clients.clear()
+    aws_operations._presigned_url_cache.clear()
+    signer = CountingSigner(aws_operations._get_s3_signer())
+    aws_operations._aws_clients['s3_signer'] = signer
+    yield signer
+    aws_operations._aws_clients.clear()
+    aws_operations._presigned_url_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Start of a signing window, so tests can move within or past it
+    now = [float(WINDOW * 500000)]
+    monkeypatch.setattr(aws_operations.time, 'time', lambda: now[0])
+    return now
+
+
+def expire_credentials_at(monkeypatch, timestamp):
+    monkeypatch.setenv('AWS_CREDENTIAL_EXPIRATION', datetime.fromtimestamp(timestamp, timezone.utc).isoformat())
+
+
+def url_expires_in(url):
+    return int(parse_qs(urlparse(url).query)['X-Amz-Expires'][0])
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('resumes/c1.pdf', 'resumes/c1.pdf'),
+    ('https://test-bucket.s3.us-east-1.amazonaws.com/resumes/c1.pdf', 'resumes/c1.pdf'),
+    ('https://test-bucket.s3.amazonaws.com/resumes/a%20b.pdf', 'resumes/a b.pdf'),
+    ('https://s3.us-east-1.amazonaws.com/test-bucket/resumes/c1.pdf', 'resumes/c1.pdf'),
+    ('https://other-bucket.s3.us-east-1.amazonaws.com/resumes/c1.pdf', None),
+    ('https://s3.us-east-1.amazonaws.com/other-bucket/resumes/c1.pdf', None),
+    ('https://example.com/resumes/c1.pdf', None),
+    ('', None),
+])
+def test_s3_url_to_key(value, expected):
+    assert s3_url_to_key(value) == expected
+
+
+def test_s3_url_to_key_with_dotted_bucket():
+    url = 'https://my.dotted.bucket.s3.us-east-1.amazonaws.com/resumes/c1.pdf'
+
+    assert s3_url_to_key(url, bucket_name='my.dotted.bucket') == 'resumes/c1.pdf'
+    assert s3_url_to_key(url, bucket_name='bucket') is None
+
+
+def test_cached_urls_are_reused_within_a_window(signer, clock):
+    first = generate_presigned_urls(['a.pdf', 'b.pdf', None])
+    clock[0] += WINDOW / 2
+    second = generate_presigned_urls(['a.pdf', 'b.pdf'])
+
+    assert set(first) == {'a.pdf', 'b.pdf'}
+    assert second == first
+    assert signer.calls == 2
+
+
+def test_urls_are_resigned_in_a_new_window(signer, clock):
+    first = generate_presigned_urls(['a.pdf'])
+    clock[0] += WINDOW
+
+    second = generate_presigned_urls(['a.pdf'])
+
+    assert signer.calls == 2
+    assert url_expires_in(second['a.pdf']) == aws_operations.PRESIGNED_URL_EXPIRY
+    assert first.keys() == second.keys()
+
+
+def test_urls_close_to_expiry_are_resigned(signer, clock, monkeypatch):
+    expire_credentials_at(monkeypatch, clock[0] + aws_operations.PRESIGNED_URL_REFRESH_MARGIN + 60)
+    generate_presigned_urls(['a.pdf'])
+    clock[0] += 61
+
+    generate_presigned_urls(['a.pdf'])
+
+    assert signer.calls == 2
+
+
+def test_credential_expiry_caps_url_lifetime_and_drops_window_tag(signer, clock, monkeypatch):
+    assert presigned_url_cache_tag() is not None
+
+    expire_credentials_at(monkeypatch, clock[0] + 59)
+    url = generate_presigned_urls(['a.pdf'])['a.pdf']
+
+    assert url_expires_in(url) == 59
+    assert presigned_url_cache_tag() is None
+
+
+def test_capped_urls_are_not_answered_with_a_window_etag(signer, clock, monkeypatch):
+    app = FastAPI()
+    app.include_router(candidate_controller.router)
+    client = TestClient(app)
+    candidates = [{'job_id': 'TL001', 'candidate_id': 'c1', 'name': 'Ann', 'email': 'a@example.com',
+                   's3_resume_key': 'resumes/c1.pdf'}]
+    monkeypatch.setattr(candidate_controller, 'get_job_version', lambda job_id: 7)
+    monkeypatch.setattr(candidate_controller, 'get_all_candidates_by_job_id', lambda job_id: candidates)
+    etag = client.get('/candidates/getAllCandidates').headers['etag']
+
+    # Rotated credentials that expire soon; URLs signed with the old ones are dropped
+    expire_credentials_at(monkeypatch, clock[0] + 59)
+    aws_operations._presigned_url_cache.clear()
+    response = client.get('/candidates/getAllCandidates', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+    assert url_expires_in(response.json()[0]['resume_url']) == 59
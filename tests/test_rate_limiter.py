@@ -0,0 +1,178 @@
+import inspect
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from app.controllers import candidate_controller, sample_controller
+from app.utils import aws_operations, rate_limiter
+from app.utils.rate_limiter import ThrottlingError, TokenBucket, call_with_backoff, get_throttle_metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def throttled(operation_name='Query'):
+    return ClientError(
+        {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Rate exceeded'}},
+        operation_name
+    )
+
+
+class ThrottlingOperation:
+    """
+    Stand-in for a boto3 method that is throttled a given number of times before succeeding
+    """
+    def __init__(self, failures, response=None):
+        self.failures = failures
+        self.response = response or {'Items': []}
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        if self.failures is None or self.calls <= self.failures:
+            raise throttled()
+        return self.response
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def isolated_limiters(clock):
+    rate_limiter._limiters.clear()
+    rate_limiter._metrics.clear()
+    aws_operations._aws_clients.clear()
+    yield
+    rate_limiter._limiters.clear()
+    rate_limiter._metrics.clear()
+    aws_operations._aws_clients.clear()
+
+
+def install_limiter(clock, resource, operation_type, rate=10.0):
+    limiter = TokenBucket(rate, clock=clock, sleep=clock.sleep)
+    rate_limiter._limiters[(resource, operation_type)] = limiter
+    return limiter
+
+
+def test_on_throttle_halves_rate(clock):
+    limiter = TokenBucket(40.0, clock=clock, sleep=clock.sleep)
+
+    limiter.on_throttle()
+    assert limiter.rate == 20.0
+
+    limiter.on_throttle()
+    assert limiter.rate == 10.0
+
+
+def test_on_throttle_respects_min_rate(clock):
+    limiter = TokenBucket(1.5, min_rate=1.0, clock=clock, sleep=clock.sleep)
+
+    limiter.on_throttle()
+    assert limiter.rate == 1.0
+
+
+def test_call_with_backoff_retries_throttling_then_succeeds(clock):
+    limiter = install_limiter(clock, 'table', 'read')
+    operation = ThrottlingOperation(failures=2, response={'Items': [{'id': 1}]})
+
+    response = call_with_backoff('table', 'read', operation, time_budget=5)
+
+    assert response == {'Items': [{'id': 1}]}
+    assert operation.calls == 3
+    assert limiter.rate < 10.0
+
+
+def test_call_with_backoff_raises_throttling_error_within_budget(clock):
+    install_limiter(clock, 'table', 'read')
+    operation = ThrottlingOperation(failures=None)
+    started = clock()
+
+    with pytest.raises(ThrottlingError) as excinfo:
+        call_with_backoff('table', 'read', operation, time_budget=2)
+
+    assert clock() - started <= 2
+    assert excinfo.value.resource == 'table'
+    assert excinfo.value.operation_type == 'read'
+    assert excinfo.value.attempts == operation.calls
+    assert excinfo.value.retry_after > 0
+
+
+def test_call_with_backoff_retries_connection_errors(clock):
+    install_limiter(clock, 'table', 'read')
+    calls = []
+
+    def flaky(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise EndpointConnectionError(endpoint_url='https://dynamodb.us-east-1.amazonaws.com')
+        return {'Items': []}
+
+    assert call_with_backoff('table', 'read', flaky, time_budget=5) == {'Items': []}
+    assert len(calls) == 2
+
+
+def test_call_with_backoff_does_not_retry_other_client_errors(clock):
+    install_limiter(clock, 'table', 'write')
+    calls = []
+
+    def invalid(**kwargs):
+        calls.append(kwargs)
+        raise ClientError({'Error': {'Code': 'ValidationException', 'Message': 'bad'}}, 'PutItem')
+
+    with pytest.raises(ClientError):
+        call_with_backoff('table', 'write', invalid, time_budget=5)
+    assert len(calls) == 1
+
+
+def test_throttle_metrics_count_throttles(clock):
+    install_limiter(clock, 'table', 'read')
+
+    call_with_backoff('table', 'read', ThrottlingOperation(failures=2), time_budget=5)
+    with pytest.raises(ThrottlingError):
+        call_with_backoff('table', 'read', ThrottlingOperation(failures=None), time_budget=1)
+
+    metrics = {(entry['resource'], entry['operation_type']): entry for entry in get_throttle_metrics()}
+    entry = metrics[('table', 'read')]
+    assert entry['throttled'] >= 3
+    assert entry['throttle_errors'] == 1
+    assert entry['requests'] == entry['throttled'] + 1
+
+
+def test_consumed_capacity_is_charged_to_the_bucket(clock):
+    limiter = install_limiter(clock, 'table', 'read')
+    operation = ThrottlingOperation(failures=0, response={'Items': [], 'ConsumedCapacity': {'CapacityUnits': 25.0}})
+
+    call_with_backoff('table', 'read', operation)
+
+    assert limiter.tokens < 0
+    assert get_throttle_metrics()[0]['consumed_capacity'] == 25.0
+
+
+class ThrottledDynamoDBClient:
+    def __init__(self):
+        self.query = ThrottlingOperation(failures=None)
+
+
+def test_get_all_candidates_raises_instead_of_returning_empty(clock):
+    install_limiter(clock, aws_operations.DYNAMODB_TABLE_NAME, 'read')
+    aws_operations._aws_clients['dynamodb_client'] = ThrottledDynamoDBClient()
+
+    with pytest.raises(ThrottlingError):
+        aws_operations.get_all_candidates_by_job_id('TL001')
+
+
+@pytest.mark.parametrize('router', [candidate_controller.router, sample_controller.router])
+def test_routes_that_may_back_off_run_in_the_threadpool(router):
+    # Backoff sleeps block, so these handlers must not run on the event loop
+    for route in router.routes:
+        assert not inspect.iscoroutinefunction(route.endpoint), route.path
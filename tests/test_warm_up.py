@@ -0,0 +1,52 @@
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from app.utils import aws_operations
+
+
+class ProbeClient:
+    """
+    Stand-in for a boto3 client that records warm-up calls and answers with `error`
+    """
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def _probe(self, name, kwargs):
+        self.calls.append((name, kwargs))
+        if self.error is not None:
+            raise self.error
+        return {}
+
+    def get_item(self, **kwargs):
+        return self._probe('get_item', kwargs)
+
+    def head_object(self, **kwargs):
+        return self._probe('head_object', kwargs)
+
+
+@pytest.fixture(autouse=True)
+def isolated_clients():
+    aws_operations._aws_clients.clear()
+    yield
+    aws_operations._aws_clients.clear()
+
+
+def install(dynamodb, s3):
+    aws_operations._aws_clients['dynamodb_client'] = dynamodb
+    aws_operations._aws_clients['s3_client'] = s3
+
+
+def test_error_responses_still_count_as_warm():
+    dynamodb = ProbeClient()
+    s3 = ProbeClient(ClientError({'Error': {'Code': '403', 'Message': 'Forbidden'}}, 'HeadObject'))
+    install(dynamodb, s3)
+
+    assert aws_operations.warm_up_connections() is True
+    assert [name for name, _ in s3.calls] == ['head_object']
+
+
+def test_unreachable_service_is_reported():
+    install(ProbeClient(), ProbeClient(EndpointConnectionError(endpoint_url='https://s3.amazonaws.com')))
+
+    assert aws_operations.warm_up_connections() is False